@@ -51,4 +51,11 @@ def create_app():
     app.register_blueprint(writing_bp, url_prefix='/api/writing')
     app.register_blueprint(admin_bp, url_prefix='/api/admin')
 
+    # Offline writing batches are collected by a periodic job, e.g. cron running `flask poll-writing-batches`
+    @app.cli.command('poll-writing-batches')
+    def poll_writing_batches_command():
+        """Collect results of finished OpenAI writing batches."""
+        from .controllers.writing_controller import poll_writing_batches
+        poll_writing_batches()
+
     return app
\ No newline at end of file
@@ -1,89 +1,54 @@
-from flask import jsonify, request
-from ..models import WritingScore, CombinedWritingScore, db, UserCredits
-from ..schemas import writing_score_schema, writing_scores_schema
+from flask import jsonify, request, current_app
+from ..models import WritingScore, CombinedWritingScore, WritingBatch, db, UserCredits
+from ..schemas import writing_score_schema, writing_scores_list_schema
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from openai import OpenAI
+from sqlalchemy import select, update, func, or_, and_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import aliased, joinedload
+from openai import OpenAI, AsyncOpenAI
 import json
+import orjson
 import re
+import asyncio
+import hashlib
+import threading
+import time
+import ahocorasick
+import tiktoken
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+from functools import lru_cache
+from datetime import datetime, timedelta
 from ..config.config import Config
 
 client = OpenAI(api_key=Config.OPENAI_API_KEY)
+_aclient = AsyncOpenAI(api_key=Config.OPENAI_API_KEY)
 
 CREDITS_PER_ANALYSIS = 1  # Define how many credits each analysis costs
 
-def calculate_overall_score(scores):
-    """Calculate the overall score as average of individual scores."""
-    return round(sum(scores) / len(scores), 1)
+SCORE_KEYS = ('task_achievement', 'coherence_cohesion', 'lexical_resource', 'grammatical_range')
 
-def calculate_word_count_penalty(word_count, task_type):
-    """Calculate penalty for insufficient word count."""
-    min_words = 150 if task_type == 'task1' else 250
-    if word_count >= min_words:
-        return 0.0
-    
-    # Calculate penalty: 0.5 points for every 25 words short
-    words_short = min_words - word_count
-    penalty = (words_short / 25) * 0.5
-    return min(penalty, 2.0)  # Maximum penalty of 2.0 points
+_MIN_WORDS = {'task1': 150, 'task2': 250}
+_TIME_LIMIT_S = {'task1': 20 * 60, 'task2': 40 * 60}  # 20 min for task1, 40 min for task2
 
-def calculate_time_penalty(time_spent, task_type):
-    """Calculate penalty for exceeding time limit."""
-    if not time_spent:
-        return 0.0
-    
-    # Time limits in minutes
-    time_limit = 20 if task_type == 'task1' else 40  # 20 min for task1, 40 min for task2
-    time_limit_seconds = time_limit * 60
-    
-    if time_spent <= time_limit_seconds:
-        return 0.0
-    
-    # Calculate penalty: 0.1 points for every minute over
-    minutes_over = (time_spent - time_limit_seconds) / 60
-    penalty = minutes_over * 0.1
-    return min(penalty, 1.0)  # Maximum penalty of 1.0 point
+CORRECTION_CATEGORIES = ('grammar', 'vocabulary', 'structure')
+HIGHLIGHT_CATEGORIES = ('grammar', 'vocabulary')
 
-def find_text_positions(essay_text, corrections):
-    """Find positions of corrections in the essay text for highlighting."""
-    highlighted_corrections = {
-        'grammar': [],
-        'vocabulary': [],
-        'structure': []
-    }
-    
-    for category in ['grammar', 'vocabulary', 'structure']:
-        if category in corrections:
-            for correction in corrections[category]:
-                original_text = correction.get('original', '')
-                if original_text and category != 'structure':  # Structure corrections don't have specific text positions
-                    # Find all occurrences of the original text
-                    positions = []
-                    start = 0
-                    while True:
-                        pos = essay_text.find(original_text, start)
-                        if pos == -1:
-                            break
-                        positions.append({
-                            'start': pos,
-                            'end': pos + len(original_text),
-                            'text': original_text
-                        })
-                        start = pos + 1
-                    
-                    if positions:
-                        correction_with_positions = correction.copy()
-                        correction_with_positions['positions'] = positions
-                        highlighted_corrections[category].append(correction_with_positions)
-                    else:
-                        highlighted_corrections[category].append(correction)
-                else:
-                    highlighted_corrections[category].append(correction)
-    
-    return highlighted_corrections
+_WORD_RE = re.compile(r"\S+")  # Same word boundaries as str.split()
 
-def analyze_essay(essay_text, task_type):
-    """Analyze essay using GPT-4 and return scores, feedback, and corrections with highlighting."""
-    system_prompt = """You are an experienced IELTS examiner with deep knowledge of the IELTS Writing assessment criteria.
+ANALYSIS_MODEL = "gpt-4o"  # Supports JSON mode, so responses always parse
+
+MAX_ESSAY_TOKENS = 6000  # Longer essays are rejected before any credits or GPT calls are spent
+MAX_ANALYSIS_TOKENS = 4096  # Completion budget; with MAX_ESSAY_TOKENS this always fits the context window
+CHARS_PER_TOKEN = 4  # Rough English average, used to cap essay length while the tokenizer is unavailable
+TOKENIZER_RETRY_INTERVAL = 300  # Seconds to wait before retrying a failed tokenizer load
+_token_encoding_value = None
+_token_encoding_failed_at = None
+_token_encoding_lock = threading.Lock()
+
+# Built once at import time and shared by every analysis request; each task type
+# gets the common instructions plus only its own rubric focus
+_SYSTEM_PROMPT_COMMON = """You are an experienced IELTS examiner with deep knowledge of the IELTS Writing assessment criteria.
     Analyze the essay and provide scores, detailed feedback, and specific corrections based on the official IELTS Writing assessment criteria.
     
     You MUST respond in the following JSON format only:
@@ -141,77 +106,377 @@ def analyze_essay(essay_text, task_type):
     2. Vocabulary: Suggest better word choices using exact words/phrases from essay
     3. Structure: Suggest improvements for sentence and paragraph structure
     
-    For Task 1, focus on:
+    """
+
+_SYSTEM_PROMPT_TASK1 = _SYSTEM_PROMPT_COMMON + """This is an IELTS Writing Task 1 response. Focus on:
     - Task Achievement: analyzing and reporting data/describing a process/object
     - Coherence and Cohesion: logical organization, paragraphing, linking
     - Lexical Resource: vocabulary range and accuracy
-    - Grammatical Range and Accuracy
-    
-    For Task 2, focus on:
+    - Grammatical Range and Accuracy"""
+
+_SYSTEM_PROMPT_TASK2 = _SYSTEM_PROMPT_COMMON + """This is an IELTS Writing Task 2 response. Focus on:
     - Task Response: addressing all parts of the task with a clear position
     - Coherence and Cohesion: logical organization, paragraphing, linking
     - Lexical Resource: vocabulary range and accuracy
     - Grammatical Range and Accuracy"""
 
-    user_prompt = f"""Please analyze this IELTS Writing {task_type} essay and respond in the required JSON format:
+_SYSTEM_MSG_BY_TASK = {
+    'task1': {"role": "system", "content": _SYSTEM_PROMPT_TASK1},
+    'task2': {"role": "system", "content": _SYSTEM_PROMPT_TASK2}
+}
 
-{essay_text}"""
+# In-process LRU cache of GPT analyses keyed by a hash of (task_type, essay_text)
+ANALYSIS_CACHE_SIZE = 512
+_analysis_cache = OrderedDict()
+_analysis_cache_lock = threading.Lock()
 
-    try:
-        response = client.chat.completions.create(
-            model="gpt-4",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
-            temperature=0.3  # Lower temperature for more consistent scoring
+# Async analyses run on one background event loop shared by all request threads
+ANALYSIS_CONCURRENCY = 20  # Maximum in-flight async GPT calls
+MAX_BATCH_ITEMS = 10  # Larger jobs go through /score/batch-offline
+BATCH_ANALYSIS_TIMEOUT = 25  # Seconds; stays under the usual 30s gunicorn worker timeout
+_analysis_loop = None
+_analysis_loop_lock = threading.Lock()
+_analysis_sem = None
+
+# Combined scores are recalculated off the request path, one at a time
+_combined_score_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='combined-score')
+
+# Batch statuses that need no further polling ('processed' means results are saved)
+BATCH_FINAL_STATUSES = ('processed', 'failed', 'expired', 'cancelled')
+# 'processing' marks a batch whose results one caller has claimed and is saving
+BATCH_LOCKED_STATUSES = ('processing',) + BATCH_FINAL_STATUSES
+# A 'processing' claim older than this is assumed to belong to a worker that died mid-save
+BATCH_CLAIM_TIMEOUT = timedelta(minutes=30)
+# OpenAI statuses after which the batch's output and error files are final
+OPENAI_BATCH_DONE_STATUSES = ('completed', 'failed', 'expired', 'cancelled')
+
+def calculate_overall_score(scores):
+    """Calculate the overall score as average of individual scores."""
+    return round(sum(scores) / len(scores), 1)
+
+@lru_cache(maxsize=4096)
+def calculate_word_count_penalty(word_count, task_type):
+    """Calculate penalty for insufficient word count."""
+    min_words = _MIN_WORDS.get(task_type, _MIN_WORDS['task2'])
+    if word_count >= min_words:
+        return 0.0
+    
+    # Calculate penalty: 0.5 points for every 25 words short
+    words_short = min_words - word_count
+    penalty = (words_short / 25) * 0.5
+    return min(penalty, 2.0)  # Maximum penalty of 2.0 points
+
+@lru_cache(maxsize=4096)
+def calculate_time_penalty(time_spent, task_type):
+    """Calculate penalty for exceeding time limit."""
+    if not time_spent:
+        return 0.0
+    
+    time_limit_seconds = _TIME_LIMIT_S.get(task_type, _TIME_LIMIT_S['task2'])
+    
+    if time_spent <= time_limit_seconds:
+        return 0.0
+    
+    # Calculate penalty: 0.1 points for every minute over
+    minutes_over = (time_spent - time_limit_seconds) / 60
+    penalty = minutes_over * 0.1
+    return min(penalty, 1.0)  # Maximum penalty of 1.0 point
+
+def find_text_positions(essay_text, corrections):
+    """Find positions of corrections in the essay text for highlighting."""
+    highlighted_corrections = {
+        'grammar': [],
+        'vocabulary': [],
+        'structure': []
+    }
+    
+    # Build a single Aho-Corasick automaton over every correction's original text
+    # so the essay is scanned once instead of once per correction. Matching stays on
+    # str rather than UTF-8 bytes: the frontend highlights by character offset, and
+    # byte offsets would need translating back for any non-ASCII essay
+    automaton = ahocorasick.Automaton()
+    for category in HIGHLIGHT_CATEGORIES:  # Structure corrections don't have specific text positions
+        for idx, correction in enumerate(corrections.get(category, [])):
+            original_text = correction.get('original', '')
+            if original_text:
+                if original_text not in automaton:
+                    automaton.add_word(original_text, (original_text, []))
+                automaton.get(original_text)[1].append((category, idx))
+    
+    # Collect non-overlapping occurrences per (category, idx) in a single pass over the essay.
+    # Matches arrive ordered by end offset, so keeping a match only when it starts at or after
+    # the previous kept match of the same text selects occurrences left to right
+    positions_by_correction = {}
+    if len(automaton):
+        automaton.make_automaton()
+        last_end = {}
+        for end, (original_text, owners) in automaton.iter(essay_text):
+            start = end - len(original_text) + 1
+            if start < last_end.get(original_text, 0):
+                continue
+            last_end[original_text] = end + 1
+            position = {
+                'start': start,
+                'end': end + 1,
+                'text': original_text
+            }
+            for owner in owners:
+                positions_by_correction.setdefault(owner, []).append(position)
+    
+    for category in CORRECTION_CATEGORIES:
+        if category in corrections:
+            for idx, correction in enumerate(corrections[category]):
+                positions = positions_by_correction.get((category, idx))
+                if positions:
+                    # Build a new dict; the input corrections may be shared with the analysis cache
+                    highlighted_corrections[category].append({**correction, 'positions': positions})
+                else:
+                    highlighted_corrections[category].append(correction)
+    
+    return highlighted_corrections
+
+def _analysis_cache_key(essay_text, task_type):
+    """Build the exact-match cache key for an essay submission."""
+    return hashlib.blake2b(f"{task_type}\0{essay_text}".encode('utf-8'), digest_size=16).hexdigest()
+
+def _get_cached_analysis(cache_key):
+    """Return a previously stored analysis, or None on a cache miss."""
+    with _analysis_cache_lock:
+        analysis = _analysis_cache.get(cache_key)
+        if analysis is not None:
+            _analysis_cache.move_to_end(cache_key)
+        return analysis
+
+def _cache_analysis(cache_key, analysis):
+    """Store an analysis, evicting the least recently used entry when full."""
+    with _analysis_cache_lock:
+        _analysis_cache[cache_key] = analysis
+        _analysis_cache.move_to_end(cache_key)
+        if len(_analysis_cache) > ANALYSIS_CACHE_SIZE:
+            _analysis_cache.popitem(last=False)
+
+def _token_encoding():
+    """Return the tokenizer for ANALYSIS_MODEL, loaded on first use, or None while it can't be loaded.
+    
+    A failed load (e.g. no network and no TIKTOKEN_CACHE_DIR) is retried after TOKENIZER_RETRY_INTERVAL
+    rather than on every request.
+    """
+    global _token_encoding_value, _token_encoding_failed_at
+    if _token_encoding_value is not None:
+        return _token_encoding_value
+    with _token_encoding_lock:
+        retry_due = (
+            _token_encoding_failed_at is None
+            or time.monotonic() - _token_encoding_failed_at >= TOKENIZER_RETRY_INTERVAL
         )
-        
-        # Parse the JSON response
-        try:
-            result = json.loads(response.choices[0].message.content)
-            # Validate response structure
-            required_keys = ['scores', 'feedback', 'corrections']
-            score_keys = ['task_achievement', 'coherence_cohesion', 'lexical_resource', 'grammatical_range']
-            
-            if not all(key in result for key in required_keys):
-                raise ValueError("Invalid response format: missing required keys")
-            
-            if not all(key in result['scores'] for key in score_keys):
-                raise ValueError("Invalid response format: missing score keys")
-            
-            if not all(key in result['feedback'] for key in score_keys):
-                raise ValueError("Invalid response format: missing feedback keys")
-            
-            if 'corrections' not in result:
-                raise ValueError("Invalid response format: missing corrections")
-            
-            # Add text highlighting positions
-            result['corrections'] = find_text_positions(essay_text, result['corrections'])
-            
-            return result
-        except json.JSONDecodeError:
-            raise ValueError("Failed to parse GPT response as JSON")
-        except Exception as e:
-            raise ValueError(f"Invalid response format: {str(e)}")
+        if _token_encoding_value is None and retry_due:
+            try:
+                _token_encoding_value = tiktoken.encoding_for_model(ANALYSIS_MODEL)
+                _token_encoding_failed_at = None
+            except Exception as e:
+                _token_encoding_failed_at = time.monotonic()
+                print(f"Error loading tokenizer, falling back to a character limit: {str(e)}")
+        return _token_encoding_value
+
+def check_essay_length(essay_text):
+    """Reject essays too long to analyze and return their token count.
+    
+    While the tokenizer is unavailable the length is capped by characters instead and None is returned.
+    """
+    encoding = _token_encoding()
+    if encoding is None:
+        if len(essay_text) > MAX_ESSAY_TOKENS * CHARS_PER_TOKEN:
+            raise ValueError("Essay exceeds maximum length")
+        return None
+    token_count = len(encoding.encode_ordinary(essay_text))
+    if token_count > MAX_ESSAY_TOKENS:
+        raise ValueError("Essay exceeds maximum length")
+    return token_count
+
+def _analysis_request(essay_text, task_type):
+    """Build the chat completion parameters for analyzing an essay."""
+    return {
+        "model": ANALYSIS_MODEL,
+        "messages": [
+            _SYSTEM_MSG_BY_TASK[task_type],
+            {"role": "user", "content": essay_text}
+        ],
+        "response_format": {"type": "json_object"},
+        "max_tokens": MAX_ANALYSIS_TOKENS,
+        "temperature": 0.3  # Lower temperature for more consistent scoring
+    }
+
+def _parse_analysis(content):
+    """Parse and validate the JSON analysis returned by GPT.
+    
+    Requests use JSON mode, so the content is always a JSON object; only missing keys need checking.
+    """
+    try:
+        analysis = orjson.loads(content)
+        scores = analysis['scores']
+        feedback = analysis['feedback']
+        _ = analysis['corrections']
+        for key in SCORE_KEYS:
+            _ = scores[key]
+            _ = feedback[key]
+        return analysis
+    except KeyError as e:
+        raise ValueError(f"Invalid response format: missing {e.args[0]}")
+
+def _with_positions(essay_text, analysis):
+    """Return a copy of the analysis with highlighting positions added to its corrections."""
+    result = dict(analysis)
+    result['corrections'] = find_text_positions(essay_text, analysis['corrections'])
+    return result
+
+def _cached_analysis(essay_text, task_type):
+    """Return (cache_key, analysis with positions), with None for the analysis on a cache miss.
+    
+    Identical re-submissions reuse the stored analysis instead of calling GPT again.
+    """
+    cache_key = _analysis_cache_key(essay_text, task_type)
+    analysis = _get_cached_analysis(cache_key)
+    return cache_key, (_with_positions(essay_text, analysis) if analysis is not None else None)
+
+def _store_analysis(essay_text, cache_key, response):
+    """Parse a GPT response, cache it and return the analysis with positions."""
+    analysis = _parse_analysis(response.choices[0].message.content)
+    # Cache the analysis without positions; highlighting is recomputed per request
+    _cache_analysis(cache_key, analysis)
+    return _with_positions(essay_text, analysis)
+
+def _analysis_failed(e):
+    """Log an analysis error and return the exception callers should raise."""
+    print(f"Error analyzing essay: {str(e)}")
+    return Exception(f"Failed to analyze essay: {str(e)}")
+
+def analyze_essay(essay_text, task_type):
+    """Analyze essay using GPT and return scores, feedback, and corrections with highlighting."""
+    try:
+        cache_key, result = _cached_analysis(essay_text, task_type)
+        if result is None:
+            response = client.chat.completions.create(**_analysis_request(essay_text, task_type))
+            result = _store_analysis(essay_text, cache_key, response)
+        return result
 
     except Exception as e:
-        print(f"Error analyzing essay: {str(e)}")
-        raise Exception(f"Failed to analyze essay: {str(e)}")
+        raise _analysis_failed(e)
+
+def _get_analysis_loop():
+    """Return the background event loop for async analyses, starting it on first use."""
+    global _analysis_loop
+    with _analysis_loop_lock:
+        if _analysis_loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name='essay-analysis-loop', daemon=True).start()
+            _analysis_loop = loop
+        return _analysis_loop
+
+def _run_async(coro, timeout=None):
+    """Run a coroutine on the background analysis loop and wait for its result."""
+    future = asyncio.run_coroutine_threadsafe(coro, _get_analysis_loop())
+    try:
+        return future.result(timeout=timeout)
+    except FuturesTimeoutError:
+        future.cancel()
+        raise
+
+async def analyze_essay_async(essay_text, task_type):
+    """Async variant of analyze_essay; concurrent calls are bounded by ANALYSIS_CONCURRENCY."""
+    global _analysis_sem
+    try:
+        cache_key, result = _cached_analysis(essay_text, task_type)
+        if result is None:
+            # Created lazily so the semaphore belongs to the running analysis loop
+            if _analysis_sem is None:
+                _analysis_sem = asyncio.Semaphore(ANALYSIS_CONCURRENCY)
+            async with _analysis_sem:
+                response = await _aclient.chat.completions.create(**_analysis_request(essay_text, task_type))
+            result = _store_analysis(essay_text, cache_key, response)
+        return result
 
-def check_and_deduct_credits(user_id):
+    except Exception as e:
+        raise _analysis_failed(e)
+
+async def _analyze_essays_async(items):
+    """Analyze several essays concurrently, returning exceptions in place of failed results."""
+    return await asyncio.gather(
+        *[analyze_essay_async(item['essay_text'], item['task_type']) for item in items],
+        return_exceptions=True
+    )
+
+def check_and_deduct_credits(user_id, analyses=1):
     """Check if user has enough credits and deduct them."""
-    user_credits = UserCredits.query.filter_by(user_id=user_id).first()
+    required_credits = CREDITS_PER_ANALYSIS * analyses
     
-    if not user_credits:
-        raise ValueError("User credits not found")
+    # Deduct in a single atomic UPDATE; the WHERE clause enforces the balance check
+    result = db.session.execute(
+        update(UserCredits)
+        .where(
+            UserCredits.user_id == user_id,
+            UserCredits.available_credits >= required_credits
+        )
+        .values(available_credits=UserCredits.available_credits - required_credits)
+    )
     
-    if user_credits.available_credits < CREDITS_PER_ANALYSIS:
+    if result.rowcount == 0:
+        user_credits = db.session.query(UserCredits.user_id).filter_by(user_id=user_id).first()
+        if not user_credits:
+            raise ValueError("User credits not found")
         raise ValueError("Insufficient credits")
     
-    user_credits.available_credits -= CREDITS_PER_ANALYSIS
     db.session.commit()
 
+def refund_credits(user_id, analyses=1):
+    """Return credits for analyses that did not produce a score; the caller commits."""
+    db.session.execute(
+        update(UserCredits)
+        .where(UserCredits.user_id == user_id)
+        .values(available_credits=UserCredits.available_credits + CREDITS_PER_ANALYSIS * analyses)
+    )
+
+def _build_writing_score(user_id, essay_text, task_type, time_spent, analysis):
+    """Create a WritingScore record from an essay analysis, applying penalties."""
+    # Calculate word count
+    word_count = len(_WORD_RE.findall(essay_text))
+    
+    # Calculate base overall score
+    base_scores = [
+        analysis['scores']['task_achievement'],
+        analysis['scores']['coherence_cohesion'],
+        analysis['scores']['lexical_resource'],
+        analysis['scores']['grammatical_range']
+    ]
+    overall_score = calculate_overall_score(base_scores)
+    
+    # Calculate penalties
+    word_count_penalty = calculate_word_count_penalty(word_count, task_type)
+    time_penalty = calculate_time_penalty(time_spent, task_type)
+    
+    # Calculate adjusted score
+    adjusted_score = max(0.0, overall_score - word_count_penalty - time_penalty)
+    
+    return WritingScore(
+        user_id=user_id,
+        task_type=task_type,
+        essay_text=essay_text,
+        word_count=word_count,
+        time_spent=time_spent,
+        task_achievement=analysis['scores']['task_achievement'],
+        coherence_cohesion=analysis['scores']['coherence_cohesion'],
+        lexical_resource=analysis['scores']['lexical_resource'],
+        grammatical_range=analysis['scores']['grammatical_range'],
+        overall_score=overall_score,
+        word_count_penalty=word_count_penalty,
+        time_penalty=time_penalty,
+        adjusted_score=adjusted_score,
+        task_achievement_feedback=analysis['feedback']['task_achievement'],
+        coherence_cohesion_feedback=analysis['feedback']['coherence_cohesion'],
+        lexical_resource_feedback=analysis['feedback']['lexical_resource'],
+        grammatical_range_feedback=analysis['feedback']['grammatical_range'],
+        corrections=analysis['corrections']  # Stored natively in a JSON column
+    )
+
 def score_essay(user_id, data):
     """Score a writing task and provide feedback with penalties and highlighting."""
     try:
@@ -219,67 +484,35 @@ def score_essay(user_id, data):
         if not data or 'essay_text' not in data or 'task_type' not in data:
             raise ValueError("Missing required fields")
         
+        if data['task_type'] not in _SYSTEM_MSG_BY_TASK:
+            raise ValueError("Invalid task type")
+        
         essay_text = data['essay_text']
         task_type = data['task_type']
         time_spent = data.get('time_spent')  # Optional time tracking
         
-        # Calculate word count
-        word_count = len(essay_text.strip().split())
+        # Reject oversized essays before spending credits
+        check_essay_length(essay_text)
         
         # Check and deduct credits before processing
         check_and_deduct_credits(user_id)
             
-        # Analyze essay using GPT-4
+        # Analyze essay using GPT
         analysis = analyze_essay(essay_text, task_type)
         
-        # Calculate base overall score
-        base_scores = [
-            analysis['scores']['task_achievement'],
-            analysis['scores']['coherence_cohesion'],
-            analysis['scores']['lexical_resource'],
-            analysis['scores']['grammatical_range']
-        ]
-        overall_score = calculate_overall_score(base_scores)
-        
-        # Calculate penalties
-        word_count_penalty = calculate_word_count_penalty(word_count, task_type)
-        time_penalty = calculate_time_penalty(time_spent, task_type)
-        
-        # Calculate adjusted score
-        adjusted_score = max(0.0, overall_score - word_count_penalty - time_penalty)
-        
         # Create new writing score record
-        writing_score = WritingScore(
-            user_id=user_id,
-            task_type=task_type,
-            essay_text=essay_text,
-            word_count=word_count,
-            time_spent=time_spent,
-            task_achievement=analysis['scores']['task_achievement'],
-            coherence_cohesion=analysis['scores']['coherence_cohesion'],
-            lexical_resource=analysis['scores']['lexical_resource'],
-            grammatical_range=analysis['scores']['grammatical_range'],
-            overall_score=overall_score,
-            word_count_penalty=word_count_penalty,
-            time_penalty=time_penalty,
-            adjusted_score=adjusted_score,
-            task_achievement_feedback=analysis['feedback']['task_achievement'],
-            coherence_cohesion_feedback=analysis['feedback']['coherence_cohesion'],
-            lexical_resource_feedback=analysis['feedback']['lexical_resource'],
-            grammatical_range_feedback=analysis['feedback']['grammatical_range'],
-            corrections=json.dumps(analysis['corrections'])  # Store corrections with positions as JSON string
-        )
+        writing_score = _build_writing_score(user_id, essay_text, task_type, time_spent, analysis)
         
         # Save to database
         db.session.add(writing_score)
         db.session.commit()
         
-        # Check for combined score calculation
-        calculate_combined_score(user_id, writing_score)
+        # Check for combined score calculation in the background
+        schedule_combined_score(user_id)
         
-        # Return the created record with corrections
+        # Return the created record with corrections, reusing the in-memory analysis
         result = writing_score_schema.dump(writing_score)
-        result['corrections'] = json.loads(writing_score.corrections) if writing_score.corrections else {}
+        result['corrections'] = analysis['corrections']
         return result
         
     except Exception as e:
@@ -288,19 +521,319 @@ def score_essay(user_id, data):
             raise e
         raise Exception(f"Failed to score essay: {str(e)}")
 
-def calculate_combined_score(user_id, new_score):
+def _validate_batch_items(data, max_items=None):
+    """Validate the items of a batch request and return them with only the fields we store."""
+    items = data.get('items') if data else None
+    if not items or not all(item and 'essay_text' in item and 'task_type' in item for item in items):
+        raise ValueError("Missing required fields")
+    
+    if max_items is not None and len(items) > max_items:
+        raise ValueError(f"At most {max_items} essays per batch; use /score/batch-offline for larger jobs")
+    
+    if not all(item['task_type'] in _SYSTEM_MSG_BY_TASK for item in items):
+        raise ValueError("Invalid task type")
+    
+    # Reject oversized essays before spending credits
+    for item in items:
+        check_essay_length(item['essay_text'])
+    
+    return [
+        {
+            'essay_text': item['essay_text'],
+            'task_type': item['task_type'],
+            'time_spent': item.get('time_spent')
+        }
+        for item in items
+    ]
+
+def score_essays_batch(user_id, data):
+    """Score several writing tasks concurrently; failed analyses are reported per item."""
+    try:
+        items = _validate_batch_items(data, MAX_BATCH_ITEMS)
+        
+        # Check and deduct credits for the whole batch before processing
+        check_and_deduct_credits(user_id, len(items))
+        
+        # Analyze all essays concurrently on the background loop
+        try:
+            analyses = _run_async(_analyze_essays_async(items), timeout=BATCH_ANALYSIS_TIMEOUT)
+        except FuturesTimeoutError:
+            refund_credits(user_id, len(items))
+            db.session.commit()
+            raise Exception("Timed out analyzing essays; use /score/batch-offline for larger jobs")
+        
+        # Failed analyses are not charged
+        failed = sum(1 for analysis in analyses if isinstance(analysis, Exception))
+        if failed:
+            refund_credits(user_id, failed)
+        
+        writing_scores = []
+        for item, analysis in zip(items, analyses):
+            if isinstance(analysis, Exception):
+                writing_scores.append(analysis)
+                continue
+            writing_score = _build_writing_score(
+                user_id, item['essay_text'], item['task_type'], item.get('time_spent'), analysis
+            )
+            db.session.add(writing_score)
+            writing_scores.append(writing_score)
+        
+        # Save to database
+        db.session.commit()
+        
+        # Check for combined score calculation in the background
+        if any(isinstance(ws, WritingScore) for ws in writing_scores):
+            schedule_combined_score(user_id)
+        
+        results = []
+        for writing_score, analysis in zip(writing_scores, analyses):
+            if isinstance(writing_score, Exception):
+                results.append({'error': str(writing_score)})
+                continue
+            result = writing_score_schema.dump(writing_score)
+            result['corrections'] = analysis['corrections']
+            results.append(result)
+        return results
+        
+    except Exception as e:
+        db.session.rollback()
+        if isinstance(e, ValueError):
+            raise e
+        raise Exception(f"Failed to score essays: {str(e)}")
+
+def submit_batch(user_id, data):
+    """Submit essays for offline scoring through the OpenAI Batch API."""
+    try:
+        items = _validate_batch_items(data)
+        
+        # Check and deduct credits for the whole batch before processing
+        check_and_deduct_credits(user_id, len(items))
+        
+        try:
+            # One chat completion request per essay, in the JSONL format expected by the Batch API
+            lines = [
+                json.dumps({
+                    "custom_id": f"{user_id}:{idx}",
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": _analysis_request(item['essay_text'], item['task_type'])
+                })
+                for idx, item in enumerate(items)
+            ]
+            batch_file = client.files.create(
+                file=("writing_batch.jsonl", "\n".join(lines).encode('utf-8')),
+                purpose="batch"
+            )
+            batch = client.batches.create(
+                input_file_id=batch_file.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h"
+            )
+            
+            writing_batch = WritingBatch(
+                user_id=user_id,
+                openai_batch_id=batch.id,
+                status=batch.status,
+                items=items
+            )
+            db.session.add(writing_batch)
+            db.session.commit()
+        except Exception:
+            # Nothing was queued or recorded, so no score can be saved for these items
+            db.session.rollback()
+            refund_credits(user_id, len(items))
+            db.session.commit()
+            raise
+        
+        return writing_batch.to_dict()
+        
+    except Exception as e:
+        db.session.rollback()
+        if isinstance(e, ValueError):
+            raise e
+        raise Exception(f"Failed to submit batch: {str(e)}")
+
+def _set_batch_status(writing_batch_id, status, from_statuses=None):
+    """Atomically update a batch's status unless it is locked; returns whether a row changed."""
+    query = update(WritingBatch).where(WritingBatch.id == writing_batch_id)
+    if from_statuses is None:
+        query = query.where(WritingBatch.status.notin_(BATCH_LOCKED_STATUSES))
+    else:
+        query = query.where(WritingBatch.status.in_(from_statuses))
+    result = db.session.execute(query.values(status=status))
+    db.session.commit()
+    return result.rowcount == 1
+
+def _batch_claimable(now):
+    """SQL condition for batches whose results nobody is currently saving."""
+    return or_(
+        WritingBatch.status.notin_(BATCH_LOCKED_STATUSES),
+        and_(WritingBatch.status == 'processing', WritingBatch.claimed_at < now - BATCH_CLAIM_TIMEOUT)
+    )
+
+def _claim_batch(writing_batch_id):
+    """Atomically mark a batch as 'processing' for this caller; returns whether the claim succeeded.
+    
+    A stale claim is taken over so a killed worker can't leave the batch stuck.
+    """
+    now = datetime.utcnow()
+    result = db.session.execute(
+        update(WritingBatch)
+        .where(
+            WritingBatch.id == writing_batch_id,
+            _batch_claimable(now)
+        )
+        .values(status='processing', claimed_at=now)
+    )
+    db.session.commit()
+    return result.rowcount == 1
+
+def _log_batch_errors(error_file_id):
+    """Log requests that OpenAI reports only in the batch's error file."""
+    for line in client.files.content(error_file_id).iter_lines():
+        if not line:
+            continue
+        record = json.loads(line)
+        response = record.get('response') or {}
+        print(f"Batch request {record.get('custom_id')} failed: {record.get('error') or response.get('body')}")
+
+def _save_batch_results(writing_batch, batch):
+    """Save a finished batch's results as writing scores and refund every item left unscored."""
+    items = writing_batch.items
+    writing_scores = {}
+    
+    # Stream the output file line by line; each line answers one custom_id
+    output_lines = client.files.content(batch.output_file_id).iter_lines() if batch.output_file_id else []
+    for line in output_lines:
+        if not line:
+            continue
+        record = json.loads(line)
+        response = record.get('response') or {}
+        if record.get('error') or response.get('status_code') != 200:
+            print(f"Batch request {record.get('custom_id')} failed: {record.get('error') or response.get('body')}")
+            continue
+        
+        idx = int(record['custom_id'].rsplit(':', 1)[1])
+        if idx in writing_scores:
+            continue
+        item = items[idx]
+        try:
+            analysis = _parse_analysis(response['body']['choices'][0]['message']['content'])
+        except Exception as e:
+            print(f"Batch request {record['custom_id']} failed: {str(e)}")
+            continue
+        
+        _cache_analysis(_analysis_cache_key(item['essay_text'], item['task_type']), analysis)
+        writing_score = _build_writing_score(
+            writing_batch.user_id,
+            item['essay_text'],
+            item['task_type'],
+            item['time_spent'],
+            _with_positions(item['essay_text'], analysis)
+        )
+        db.session.add(writing_score)
+        writing_scores[idx] = writing_score
+    
+    # Requests that failed outright are listed only in the error file
+    if batch.error_file_id:
+        _log_batch_errors(batch.error_file_id)
+    
+    # Items without a saved score are not charged
+    unscored = len(items) - len(writing_scores)
+    if unscored:
+        refund_credits(writing_batch.user_id, unscored)
+    
+    writing_batch.status = 'processed' if batch.status == 'completed' else batch.status
+    writing_batch.completed_at = datetime.utcnow()
+    db.session.commit()
+    
+    # Check for combined score calculation in the background
+    if writing_scores:
+        schedule_combined_score(writing_batch.user_id)
+
+def process_batch(writing_batch, save_results=True):
+    """Refresh a batch's status and, with save_results, save its results as writing scores once it finishes."""
+    if writing_batch.status in BATCH_FINAL_STATUSES or (writing_batch.status == 'processing' and not save_results):
+        return writing_batch
+    
+    try:
+        batch = client.batches.retrieve(writing_batch.openai_batch_id)
+        
+        if batch.status not in OPENAI_BATCH_DONE_STATUSES:
+            _set_batch_status(writing_batch.id, batch.status)
+        elif not save_results:
+            # Finished; the results are saved by the next poll_writing_batches run
+            _set_batch_status(writing_batch.id, 'finalizing')
+        elif _claim_batch(writing_batch.id):
+            # Claimed: no other worker will save these results
+            try:
+                _save_batch_results(writing_batch, batch)
+            except Exception:
+                db.session.rollback()
+                # Release the claim so the results are collected on the next poll
+                _set_batch_status(writing_batch.id, 'finalizing', from_statuses=('processing',))
+                raise
+        
+        db.session.refresh(writing_batch)
+        return writing_batch
+        
+    except Exception as e:
+        db.session.rollback()
+        raise Exception(f"Failed to process batch: {str(e)}")
+
+def get_batch(batch_id, user_id):
+    """Get a batch for the current user with its status refreshed.
+    
+    Saving results can outlast a request, so that is left to poll_writing_batches.
+    """
+    try:
+        writing_batch = WritingBatch.query.filter_by(id=batch_id, user_id=user_id).first()
+        if not writing_batch:
+            raise ValueError("Batch not found")
+        return process_batch(writing_batch, save_results=False).to_dict()
+    except Exception as e:
+        raise e
+
+def poll_writing_batches():
+    """Process every batch that is still pending; intended to be run periodically by a worker."""
+    pending_batches = WritingBatch.query.filter(_batch_claimable(datetime.utcnow())).all()
+    for writing_batch in pending_batches:
+        try:
+            process_batch(writing_batch)
+        except Exception as e:
+            print(f"Error polling batch {writing_batch.id}: {str(e)}")
+
+def schedule_combined_score(user_id):
+    """Queue a combined score recalculation so it runs after the response is returned."""
+    _combined_score_executor.submit(_run_combined_score_task, current_app._get_current_object(), user_id)
+
+def _run_combined_score_task(app, user_id):
+    """Background task: recalculate the combined score in its own app context and DB session."""
+    with app.app_context():
+        calculate_combined_score(user_id)
+
+def calculate_combined_score(user_id):
     """Calculate combined score when both Task 1 and Task 2 are available."""
     try:
-        # Get the most recent scores for both tasks
-        task1_score = WritingScore.query.filter_by(
-            user_id=user_id, 
-            task_type='task1'
-        ).order_by(WritingScore.created_at.desc()).first()
+        # Get the most recent scores for both tasks in a single windowed query
+        latest = select(
+            WritingScore,
+            func.row_number().over(
+                partition_by=WritingScore.task_type,
+                order_by=WritingScore.created_at.desc()
+            ).label('rn')
+        ).where(
+            WritingScore.user_id == user_id,
+            WritingScore.task_type.in_(('task1', 'task2'))
+        ).subquery()
+        latest_score = aliased(WritingScore, latest)
+        latest_scores = db.session.execute(
+            select(latest_score).where(latest.c.rn == 1)
+        ).scalars().all()
         
-        task2_score = WritingScore.query.filter_by(
-            user_id=user_id, 
-            task_type='task2'
-        ).order_by(WritingScore.created_at.desc()).first()
+        latest_by_task = {score.task_type: score for score in latest_scores}
+        task1_score = latest_by_task.get('task1')
+        task2_score = latest_by_task.get('task2')
         
         if task1_score and task2_score:
             # Calculate combined score: Task 1 (1/3) + Task 2 (2/3)
@@ -309,34 +842,47 @@ def calculate_combined_score(user_id, new_score):
                 1
             )
             
-            # Check if combined score already exists for these specific scores
-            existing_combined = CombinedWritingScore.query.filter_by(
+            # Create new combined score record; the unique constraint rejects existing pairs
+            combined_writing_score = CombinedWritingScore(
                 user_id=user_id,
                 task1_score_id=task1_score.id,
-                task2_score_id=task2_score.id
-            ).first()
+                task2_score_id=task2_score.id,
+                combined_score=combined_score
+            )
             
-            if not existing_combined:
-                # Create new combined score record
-                combined_writing_score = CombinedWritingScore(
-                    user_id=user_id,
-                    task1_score_id=task1_score.id,
-                    task2_score_id=task2_score.id,
-                    combined_score=combined_score
-                )
-                
+            try:
                 db.session.add(combined_writing_score)
                 db.session.commit()
+            except IntegrityError:
+                db.session.rollback()  # Combined score already exists for these specific scores
                 
     except Exception as e:
         print(f"Error calculating combined score: {str(e)}")
         # Don't raise error as this is not critical to the main scoring process
 
-def get_user_scores(user_id):
-    """Get all writing scores for the current user."""
+def get_user_scores(user_id, before=None, before_id=None, limit=50):
+    """Get a page of writing scores for the current user, newest first.
+    
+    Pass the previous page's next_cursor as `before` (created_at) and `before_id` (id)
+    to fetch older scores; id breaks ties between scores saved in the same instant.
+    """
     try:
-        scores = WritingScore.query.filter_by(user_id=user_id).order_by(WritingScore.created_at.desc()).all()
-        return writing_scores_schema.dump(scores)
+        query = WritingScore.query.filter_by(user_id=user_id)
+        if before and before_id:
+            query = query.filter(or_(
+                WritingScore.created_at < before,
+                and_(WritingScore.created_at == before, WritingScore.id < before_id)
+            ))
+        elif before:
+            query = query.filter(WritingScore.created_at < before)
+        scores = query.order_by(WritingScore.created_at.desc(), WritingScore.id.desc()).limit(limit).all()
+        next_cursor = None
+        if len(scores) == limit:
+            next_cursor = {'created_at': scores[-1].created_at.isoformat(), 'id': scores[-1].id}
+        return {
+            'items': writing_scores_list_schema.dump(scores),
+            'next_cursor': next_cursor
+        }
     except Exception as e:
         raise e
 
@@ -353,7 +899,10 @@ def get_score(score_id, user_id):
 def get_combined_scores(user_id):
     """Get all combined writing scores for the current user."""
     try:
-        combined_scores = CombinedWritingScore.query.filter_by(user_id=user_id).order_by(CombinedWritingScore.created_at.desc()).all()
-        return [score.to_dict() for score in combined_scores]
+        combined_scores = CombinedWritingScore.query.options(
+            joinedload(CombinedWritingScore.task1_score),
+            joinedload(CombinedWritingScore.task2_score)
+        ).filter_by(user_id=user_id).order_by(CombinedWritingScore.created_at.desc()).all()
+        return [score.to_dict(summary=True) for score in combined_scores]
     except Exception as e:
         raise e 
\ No newline at end of file
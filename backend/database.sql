@@ -115,7 +115,7 @@ CREATE TABLE WritingScores (
   grammatical_range_feedback TEXT,
   
   -- Corrections data
-  corrections TEXT,
+  corrections JSON,
   
   created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
   
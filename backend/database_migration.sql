@@ -23,4 +23,34 @@ CREATE TABLE CombinedWritingScores (
 );
 
 -- Update existing records to set adjusted_score = overall_score for backward compatibility
-UPDATE WritingScores SET adjusted_score = overall_score WHERE adjusted_score = 0.0; 
\ No newline at end of file
+UPDATE WritingScores SET adjusted_score = overall_score WHERE adjusted_score = 0.0; 
+
+-- Create WritingBatches table for essays scored through the OpenAI Batch API
+CREATE TABLE WritingBatches (
+    id VARCHAR(36) PRIMARY KEY,
+    user_id VARCHAR(36) NOT NULL,
+    openai_batch_id VARCHAR(100) NOT NULL UNIQUE,
+    status VARCHAR(20) NOT NULL DEFAULT 'validating',
+    items JSON NOT NULL,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    claimed_at DATETIME,
+    completed_at DATETIME,
+    FOREIGN KEY (user_id) REFERENCES Users(id) ON DELETE CASCADE
+);
+
+-- Indexes for the latest-score lookup and duplicate check in calculate_combined_score
+CREATE INDEX ix_writing_scores_user_task_created ON WritingScores (user_id, task_type, created_at DESC);
+-- Remove duplicate combined scores for the same pair, keeping the earliest, so the constraint can be added
+DELETE c1 FROM CombinedWritingScores c1
+JOIN CombinedWritingScores c2
+    ON c1.user_id = c2.user_id
+    AND c1.task1_score_id = c2.task1_score_id
+    AND c1.task2_score_id = c2.task2_score_id
+    AND (c1.created_at > c2.created_at OR (c1.created_at = c2.created_at AND c1.id > c2.id));
+ALTER TABLE CombinedWritingScores ADD CONSTRAINT uq_combined_writing_scores_pair UNIQUE (user_id, task1_score_id, task2_score_id);
+
+-- Store corrections as native JSON instead of a serialized TEXT string
+ALTER TABLE WritingScores MODIFY COLUMN corrections JSON;
+
+-- Index for paginating a user's score history newest first
+CREATE INDEX ix_writing_scores_user_created ON WritingScores (user_id, created_at DESC, id DESC);
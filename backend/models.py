@@ -1,7 +1,6 @@
 from datetime import datetime
 import uuid
 from .extensions import db
-import json
 
 def generate_uuid():
     return str(uuid.uuid4())
@@ -90,6 +89,16 @@ class UserCredits(db.Model):
     available_credits = db.Column(db.Integer, default=0)
     last_updated = db.Column(db.DateTime, default=datetime.utcnow)
 
+# Long-form fields left out of score summaries such as list views
+WRITING_SCORE_DETAIL_FIELDS = (
+    'essay_text',
+    'corrections',
+    'task_achievement_feedback',
+    'coherence_cohesion_feedback',
+    'lexical_resource_feedback',
+    'grammatical_range_feedback'
+)
+
 class WritingScore(db.Model):
     __tablename__ = 'WritingScores'
     
@@ -123,15 +132,22 @@ class WritingScore(db.Model):
     grammatical_range_feedback = db.Column(db.Text)
     
     # Corrections data with highlighting positions
-    corrections = db.Column(db.Text)
+    corrections = db.Column(db.JSON)
     
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     # Relationships
     user = db.relationship('User', backref=db.backref('writing_scores', lazy=True))
 
-    def to_dict(self):
-        return {
+    __table_args__ = (
+        # Serves the latest-score-per-task lookup in calculate_combined_score
+        db.Index('ix_writing_scores_user_task_created', user_id, task_type, created_at.desc()),
+        # Serves keyset pagination of a user's score history
+        db.Index('ix_writing_scores_user_created', user_id, created_at.desc(), id.desc()),
+    )
+
+    def to_dict(self, summary=False):
+        data = {
             'id': self.id,
             'user_id': self.user_id,
             'task_type': self.task_type,
@@ -150,9 +166,13 @@ class WritingScore(db.Model):
             'coherence_cohesion_feedback': self.coherence_cohesion_feedback,
             'lexical_resource_feedback': self.lexical_resource_feedback,
             'grammatical_range_feedback': self.grammatical_range_feedback,
-            'corrections': json.loads(self.corrections) if self.corrections else {},
+            'corrections': self.corrections or {},
             'created_at': self.created_at.isoformat()
         }
+        if summary:
+            for field in WRITING_SCORE_DETAIL_FIELDS:
+                del data[field]
+        return data
 
 # Add new model for combined scores
 class CombinedWritingScore(db.Model):
@@ -173,7 +193,13 @@ class CombinedWritingScore(db.Model):
     task1_score = db.relationship('WritingScore', foreign_keys=[task1_score_id])
     task2_score = db.relationship('WritingScore', foreign_keys=[task2_score_id])
 
-    def to_dict(self):
+    __table_args__ = (
+        # One combined score per (task1, task2) pair
+        db.UniqueConstraint('user_id', 'task1_score_id', 'task2_score_id', name='uq_combined_writing_scores_pair'),
+    )
+
+    def to_dict(self, summary=False):
+        """Serialize with nested task scores; summary=True leaves out their essay text and feedback."""
         return {
             'id': self.id,
             'user_id': self.user_id,
@@ -181,6 +207,39 @@ class CombinedWritingScore(db.Model):
             'task2_score_id': self.task2_score_id,
             'combined_score': self.combined_score,
             'created_at': self.created_at.isoformat(),
-            'task1_score': self.task1_score.to_dict() if self.task1_score else None,
-            'task2_score': self.task2_score.to_dict() if self.task2_score else None
-        } 
\ No newline at end of file
+            'task1_score': self.task1_score.to_dict(summary=summary) if self.task1_score else None,
+            'task2_score': self.task2_score.to_dict(summary=summary) if self.task2_score else None
+        } 
+
+# Essays submitted together through the OpenAI Batch API
+class WritingBatch(db.Model):
+    __tablename__ = 'WritingBatches'
+    
+    id = db.Column(db.String(36), primary_key=True, default=generate_uuid)
+    user_id = db.Column(db.String(36), db.ForeignKey('Users.id', ondelete='CASCADE'), nullable=False)
+    openai_batch_id = db.Column(db.String(100), unique=True, nullable=False)
+    
+    # OpenAI batch status, or 'processed' once results are saved as WritingScores
+    status = db.Column(db.String(20), nullable=False, default='validating')
+    
+    # Submitted essays, indexed by the batch request custom_id
+    items = db.Column(db.JSON, nullable=False)
+    
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # When a worker last claimed the batch to save its results
+    claimed_at = db.Column(db.DateTime, nullable=True)
+    completed_at = db.Column(db.DateTime, nullable=True)
+    
+    # Relationships
+    user = db.relationship('User', backref=db.backref('writing_batches', lazy=True))
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'user_id': self.user_id,
+            'openai_batch_id': self.openai_batch_id,
+            'status': self.status,
+            'item_count': len(self.items) if self.items else 0,
+            'created_at': self.created_at.isoformat(),
+            'completed_at': self.completed_at.isoformat() if self.completed_at else None
+        }
@@ -1,9 +1,12 @@
 from flask import Blueprint, jsonify, request
+from datetime import datetime
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from ..controllers.writing_controller import score_essay, get_user_scores, get_score, get_combined_scores
+from ..controllers.writing_controller import score_essay, score_essays_batch, submit_batch, get_batch, get_user_scores, get_score, get_combined_scores
 
 writing_bp = Blueprint('writing', __name__)
 
+MAX_SCORES_PAGE_SIZE = 100
+
 @writing_bp.route('/score', methods=['POST'])
 @jwt_required()
 def create_score():
@@ -15,12 +18,48 @@ def create_score():
     except Exception as e:
         return jsonify({'error': str(e)}), 400
 
+@writing_bp.route('/score/batch', methods=['POST'])
+@jwt_required()
+def create_scores_batch():
+    try:
+        data = request.get_json()
+        user_id = get_jwt_identity()
+        results = score_essays_batch(user_id, data)
+        return jsonify(results), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 400
+
+@writing_bp.route('/score/batch-offline', methods=['POST'])
+@jwt_required()
+def create_offline_batch():
+    try:
+        data = request.get_json()
+        user_id = get_jwt_identity()
+        batch = submit_batch(user_id, data)
+        return jsonify(batch), 202
+    except Exception as e:
+        return jsonify({'error': str(e)}), 400
+
+@writing_bp.route('/batches/<batch_id>', methods=['GET'])
+@jwt_required()
+def get_batch_detail(batch_id):
+    try:
+        user_id = get_jwt_identity()
+        batch = get_batch(batch_id, user_id)
+        return jsonify(batch), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 400
+
 @writing_bp.route('/scores', methods=['GET'])
 @jwt_required()
 def list_scores():
     try:
         user_id = get_jwt_identity()
-        scores = get_user_scores(user_id)
+        before = request.args.get('before')
+        before = datetime.fromisoformat(before) if before else None
+        before_id = request.args.get('before_id')
+        limit = min(max(request.args.get('limit', 50, type=int), 1), MAX_SCORES_PAGE_SIZE)
+        scores = get_user_scores(user_id, before=before, before_id=before_id, limit=limit)
         return jsonify(scores), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 400
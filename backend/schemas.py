@@ -1,6 +1,6 @@
 from marshmallow_sqlalchemy import SQLAlchemyAutoSchema
 from marshmallow import fields, validate, validates, ValidationError
-from .models import User, Essay, EssaySuggestion, AIChat, Export, Subscription, Payment, UserCredits, WritingScore
+from .models import User, Essay, EssaySuggestion, AIChat, Export, Subscription, Payment, UserCredits, WritingScore, WRITING_SCORE_DETAIL_FIELDS
 
 class UserSchema(SQLAlchemyAutoSchema):
     class Meta:
@@ -81,6 +81,11 @@ class WritingScoreSchema(SQLAlchemyAutoSchema):
         if value * 2 % 1 != 0:
             raise ValidationError("Score must be in 0.5 increments")
 
+class WritingScoreListSchema(WritingScoreSchema):
+    # Summaries carry user_id like WritingScore.to_dict(summary=True)
+    class Meta(WritingScoreSchema.Meta):
+        include_fk = True
+
 # Initialize schemas
 user_schema = UserSchema()
 users_schema = UserSchema(many=True)
@@ -99,4 +104,8 @@ payments_schema = PaymentSchema(many=True)
 user_credits_schema = UserCreditsSchema()
 user_credits_list_schema = UserCreditsSchema(many=True)
 writing_score_schema = WritingScoreSchema()
-writing_scores_schema = WritingScoreSchema(many=True) 
\ No newline at end of file
+writing_scores_schema = WritingScoreSchema(many=True)
+
+# List views skip the essay body, feedback and corrections; clients fetch those per score
+writing_score_list_schema = WritingScoreListSchema(exclude=WRITING_SCORE_DETAIL_FIELDS)
+writing_scores_list_schema = WritingScoreListSchema(many=True, exclude=WRITING_SCORE_DETAIL_FIELDS) 
\ No newline at end of file
@@ -1,13 +1,16 @@
 import React, { useState, useEffect } from 'react';
-import writingService, { WritingScore, CombinedWritingScore } from '../../services/writing.service';
+import writingService, { WritingScore, WritingScoreSummary, CombinedWritingScore, WritingScoresCursor } from '../../services/writing.service';
 import { ScoreDisplay } from '../../components/Writing/ScoreDisplay';
 import { useNavigate } from 'react-router-dom';
 import { motion, AnimatePresence } from 'framer-motion';
 
 const WritingScores: React.FC = () => {
-  const [scores, setScores] = useState<WritingScore[]>([]);
+  const [scores, setScores] = useState<WritingScoreSummary[]>([]);
+  const [nextCursor, setNextCursor] = useState<WritingScoresCursor | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [combinedScores, setCombinedScores] = useState<CombinedWritingScore[]>([]);
   const [expandedScoreId, setExpandedScoreId] = useState<string | null>(null);
+  const [scoreDetails, setScoreDetails] = useState<Record<string, WritingScore>>({});
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
   const [showCombinedScores, setShowCombinedScores] = useState(false);
@@ -21,8 +24,9 @@ const WritingScores: React.FC = () => {
   const fetchScores = async () => {
     try {
       setLoading(true);
-      const userScores = await writingService.getUserScores();
-      setScores(userScores || []);
+      const page = await writingService.getUserScores();
+      setScores(page?.items || []);
+      setNextCursor(page?.next_cursor ?? null);
       setError(null);
     } catch (err) {
       console.error('Error fetching scores:', err);
@@ -33,6 +37,20 @@ const WritingScores: React.FC = () => {
     }
   };
 
+  const fetchMoreScores = async () => {
+    if (!nextCursor) return;
+    try {
+      setLoadingMore(true);
+      const page = await writingService.getUserScores(nextCursor);
+      setScores((prev) => [...prev, ...(page?.items || [])]);
+      setNextCursor(page?.next_cursor ?? null);
+    } catch (err) {
+      console.error('Error fetching more scores:', err);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const fetchCombinedScores = async () => {
     try {
       const userCombinedScores = await writingService.getCombinedScores();
@@ -42,8 +60,19 @@ const WritingScores: React.FC = () => {
     }
   };
 
-  const handleScoreClick = (scoreId: string) => {
-    setExpandedScoreId(expandedScoreId === scoreId ? null : scoreId);
+  const handleScoreClick = async (scoreId: string) => {
+    const expanding = expandedScoreId !== scoreId;
+    setExpandedScoreId(expanding ? scoreId : null);
+
+    // The list only carries summary fields; fetch the essay, feedback and corrections on demand
+    if (expanding && !scoreDetails[scoreId]) {
+      try {
+        const detail = await writingService.getScore(scoreId);
+        setScoreDetails((prev) => ({ ...prev, [scoreId]: detail }));
+      } catch (err) {
+        console.error('Error fetching score details:', err);
+      }
+    }
   };
 
   const formatDate = (dateString: string) => {
@@ -314,7 +343,7 @@ const WritingScores: React.FC = () => {
 
                         {/* Expandable Score Details */}
                         <AnimatePresence>
-                          {expandedScoreId === score.id && (
+                          {expandedScoreId === score.id && scoreDetails[score.id] && (
                             <motion.div
                               initial={{ height: 0, opacity: 0 }}
                               animate={{ height: "auto", opacity: 1 }}
@@ -358,7 +387,7 @@ const WritingScores: React.FC = () => {
                                 <div className="mb-6">
                                   <h3 className="text-lg font-semibold text-gray-800 mb-3">Your Essay (with corrections highlighted)</h3>
                                   <div className="bg-gray-50 rounded-lg p-4 text-gray-700 whitespace-pre-wrap max-h-64 overflow-y-auto">
-                                    {renderHighlightedText(score.essay_text, score)}
+                                    {renderHighlightedText(scoreDetails[score.id].essay_text, scoreDetails[score.id])}
                                   </div>
                                   <div className="mt-2 text-sm text-gray-500 flex gap-4">
                                     <span className="flex items-center gap-1">
@@ -372,11 +401,11 @@ const WritingScores: React.FC = () => {
                                   </div>
                                 </div>
 
-                                <ScoreDisplay score={score} />
+                                <ScoreDisplay score={scoreDetails[score.id]} />
 
                                 {/* Corrections Section */}
                                 {(() => {
-                                  const corrections = writingService.parseCorrections(score);
+                                  const corrections = writingService.parseCorrections(scoreDetails[score.id]);
                                   return (corrections.grammar?.length > 0 ||
                                     corrections.vocabulary?.length > 0 ||
                                     corrections.structure?.length > 0) && (
@@ -499,6 +528,16 @@ const WritingScores: React.FC = () => {
                       </motion.div>
                     ))}
                   </AnimatePresence>
+                  {nextCursor && (
+                    <button
+                      onClick={fetchMoreScores}
+                      disabled={loadingMore}
+                      className="mx-auto px-6 py-3 bg-white text-blue-600 border border-blue-200 rounded-xl
+                               hover:bg-blue-50 transition-all shadow-sm disabled:opacity-50"
+                    >
+                      {loadingMore ? 'Loading...' : 'Load older scores'}
+                    </button>
+                  )}
                 </div>
               )}
             </>
@@ -19,10 +19,34 @@ export interface WritingScore {
   coherence_cohesion_feedback: string;
   lexical_resource_feedback: string;
   grammatical_range_feedback: string;
-  corrections: string;
+  corrections: Corrections;
   created_at: string;
 }
 
+// List payloads leave out the essay, feedback and corrections; fetch a WritingScore for those
+export type WritingScoreSummary = Omit<
+  WritingScore,
+  | 'user'
+  | 'essay_text'
+  | 'task_achievement_feedback'
+  | 'coherence_cohesion_feedback'
+  | 'lexical_resource_feedback'
+  | 'grammatical_range_feedback'
+  | 'corrections'
+> & {
+  user_id: string;
+};
+
+export interface WritingScoresCursor {
+  created_at: string;
+  id: string;
+}
+
+export interface WritingScoresPage {
+  items: WritingScoreSummary[];
+  next_cursor: WritingScoresCursor | null;
+}
+
 export interface ScoreEssayRequest {
   task_type: 'task1' | 'task2';
   essay_text: string;
@@ -36,8 +60,8 @@ export interface CombinedWritingScore {
   task2_score_id?: string;
   combined_score: number;
   created_at: string;
-  task1_score?: WritingScore;
-  task2_score?: WritingScore;
+  task1_score?: WritingScoreSummary;
+  task2_score?: WritingScoreSummary;
 }
 
 export interface TextPosition {
@@ -69,7 +93,12 @@ interface Corrections {
 class WritingService {
   parseCorrections(score: WritingScore): Corrections {
     try {
-      return JSON.parse(score.corrections);
+      // Corrections come back as a JSON object; older responses sent a serialized string
+      const corrections: Corrections | string = score.corrections;
+      if (typeof corrections === 'string') {
+        return JSON.parse(corrections);
+      }
+      return corrections ?? { grammar: [], vocabulary: [], structure: [] };
     } catch (e) {
       console.error('Error parsing corrections:', e);
       return {
@@ -158,9 +187,11 @@ class WritingService {
     }
   }
 
-  async getUserScores(): Promise<WritingScore[]> {
+  async getUserScores(cursor?: WritingScoresCursor): Promise<WritingScoresPage> {
     try {
-      const response = await apiClient.get<WritingScore[]>('/writing/scores');
+      const response = await apiClient.get<WritingScoresPage>('/writing/scores', {
+        params: cursor ? { before: cursor.created_at, before_id: cursor.id } : undefined
+      });
       return response.data;
     } catch (error) {
       console.error('Error getting user scores:', error);